@@ -4,7 +4,17 @@ import threading
 import subprocess
 import platform
 import time
-from tkinter import filedialog, messagebox
+import atexit
+import tempfile
+import shutil
+import asyncio
+import contextlib
+import collections
+import json
+import importlib.util
+import glob
+import re
+from pathlib import Path
 import customtkinter as ctk
 
 # Configuração inicial do CustomTkinter
@@ -16,29 +26,112 @@ class DocumentConverter:
     Classe responsável pela lógica de conversão de documentos.
     Gerencia a detecção de ferramentas (Word/LibreOffice) e a execução da conversão.
     """
+    SUPPORTED_EXTENSIONS = frozenset({'.docx', '.doc', '.odt', '.rtf'})
+    # Mesmas extensões sem o ponto, para comparar com name.rpartition('.')[2]
+    SUPPORTED_NO_DOT = frozenset(e[1:] for e in SUPPORTED_EXTENSIONS)
+    # Extensões que preferimos converter com o Word (quando disponível)
+    WORD_EXTENSIONS = frozenset({'.docx', '.doc'})
+
+    # Tempo máximo para o LibreOffice residente (modo listener, via UNO) aceitar conexões
+    SOFFICE_STARTUP_TIMEOUT = 20
+    # Máximo de arquivos por chamada avulsa do soffice (lotes maiores não ganham
+    # desempenho e um timeout derrubaria mais arquivos de uma vez)
+    BATCH_SIZE = 10
+    # Máximo de conversões do LibreOffice em andamento ao mesmo tempo, somando lotes e
+    # refações arquivo a arquivo (cada processo avulso tem seu perfil e ocupa centenas de MB);
+    # uma conversão no LibreOffice residente também ocupa uma vaga
+    MAX_SOFFICE_PROCESSES = 4
+    # Quanto do stderr do soffice é guardado para a mensagem de erro (apenas o final)
+    STDERR_TAIL_BYTES = 4096
+    # Argumentos do Popen que, fora destes valores padrão, obrigam o CPython a usar
+    # fork+exec no Linux em vez do vfork (disponível só a partir do Python 3.10)
+    FAST_SPAWN_DEFAULTS = {
+        "preexec_fn": None, "pass_fds": (), "shell": False, "start_new_session": False,
+        "process_group": None, "user": None, "group": None, "extra_groups": None, "umask": -1,
+    }
+    # Locais comuns do LibreOffice no Linux, em ordem de preferência
+    LINUX_CANDIDATES = (
+        '/usr/bin/soffice',
+        '/usr/bin/libreoffice',
+        '/usr/lib/libreoffice/program/soffice',
+        '/snap/bin/libreoffice',
+    )
+    # Sistemas de arquivos de rede (Linux): saída nesses destinos passa pela pasta temporária local
+    NETWORK_FS_TYPES = frozenset({
+        "nfs", "nfs4", "cifs", "smb3", "smbfs", "9p", "afs", "ceph",
+        "glusterfs", "fuse.glusterfs", "fuse.sshfs", "davfs", "fuse.davfs2",
+    })
+    # Cache da detecção do LibreOffice entre execuções do programa
+    PROBE_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "conversor", "probe.json")
+
     def __init__(self):
+        # Plataforma e STARTUPINFO calculados uma única vez (usados a cada conversão)
+        self._system = platform.system()
+        self._is_windows = self._system == "Windows"
+        self._startupinfo = None
+        if self._is_windows:
+            # No Windows, subprocess precisa de tratamento especial para não abrir janelas de console
+            self._startupinfo = subprocess.STARTUPINFO()
+            self._startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+
         self.has_word = self._check_word_installed()
-        self.libreoffice_path = self._find_libreoffice()
-        self.supported_extensions = ['.docx', '.doc', '.odt', '.rtf']
+        self.libreoffice_path = self._load_probe_cache()
+        if self.libreoffice_path is None:
+            self.libreoffice_path = self._find_libreoffice()
+            self._save_probe_cache()
+
+        # Processo do LibreOffice mantido aberto entre conversões
+        self._soffice_proc = None
+        self._uno_desktop = None
+        self._uno_disabled = False
+        self._soffice_lock = threading.Lock()
+        # Pipe nomeado exclusivo deste processo: outra instância do programa (ou outro
+        # soffice qualquer) não é confundida com o nosso LibreOffice residente
+        self._soffice_pipe = f"conv_{os.getpid()}"
+        self._resident_profile = None
+        atexit.register(self._shutdown_soffice)
+
+        # O Word é uma instância COM única por máquina e o docx2pdf o encerra ao final
+        # de cada chamada, então as conversões com Word não podem se sobrepor
+        self._word_lock = threading.Lock()
+
+        # Perfis de usuário do LibreOffice, emprestados um por processo em execução:
+        # instâncias com o mesmo perfil se serializam, com perfis distintos rodam em paralelo
+        self._free_profiles = []
+        self._profile_dirs = []
+        self._profile_lock = threading.Lock()
+        atexit.register(self._cleanup_profiles)
+        # Vagas de MAX_SOFFICE_PROCESSES, criadas no loop assíncrono de cada conversão
+        self._soffice_slots = None
+        self._soffice_slots_loop = None
+
+        # Estratégia de saída do LibreOffice: por padrão grava direto na pasta de destino.
+        # Para destinos em compartilhamento de rede, grava numa pasta temporária local e
+        # depois move o PDF. None = automático; True/False forçam a estratégia (o modo
+        # temporário nunca é usado com LibreOffice confinado em snap/flatpak, que tem /tmp próprio).
+        self.scratch_output = None
+        self._scratch = None
+        self._scratch_lock = threading.Lock()
+        self._network_folders = {}
+        self._mount_table = None
+        atexit.register(self._cleanup_scratch)
 
     def _check_word_installed(self):
         """Verifica se o MS Word está instalado (apenas Windows)."""
-        if platform.system() != "Windows":
+        if not self._is_windows:
             return False
         try:
-            # Tenta importar docx2pdf apenas se estiver no Windows
-            import docx2pdf
+            # Apenas localiza o docx2pdf, sem importá-lo: a importação (pywin32/COM) é cara
+            # e só é feita em convert_to_pdf quando um .docx/.doc for de fato convertido.
             # Uma verificação mais robusta seria tentar instanciar o COM object,
-            # mas a importação já é um bom indício se a lib estiver instalada.
-            return True
-        except ImportError:
-            return False
+            # mas a presença da lib já é um bom indício.
+            return importlib.util.find_spec("docx2pdf") is not None
         except Exception:
             return False
 
     def _find_libreoffice(self):
         """Tenta localizar o executável do LibreOffice."""
-        system = platform.system()
+        system = self._system
         paths_to_check = []
 
         if system == "Windows":
@@ -51,8 +144,12 @@ class DocumentConverter:
                 "/Applications/LibreOffice.app/Contents/MacOS/soffice"
             ]
         else:  # Linux
-            # No Linux, 'soffice' ou 'libreoffice' geralmente estão no PATH
-            return "soffice"
+            # Os caminhos usuais das distribuições resolvem quase sempre com um único stat;
+            # só se nenhum existir é que o PATH é varrido
+            for path in self.LINUX_CANDIDATES:
+                if os.path.exists(path):
+                    return path
+            return shutil.which("soffice")
 
         for path in paths_to_check:
             if os.path.exists(path):
@@ -61,91 +158,770 @@ class DocumentConverter:
         # Se não encontrar nos caminhos padrão, tenta chamar pelo comando se estiver no PATH
         return "soffice" if self._is_command_available("soffice") else None
 
+    def _load_probe_cache(self):
+        """
+        Lê o caminho do LibreOffice salvo em execuções anteriores.
+        Só é aceito se for da mesma plataforma e o executável não tiver mudado (mtime).
+        """
+        try:
+            with open(self.PROBE_CACHE_PATH, encoding="utf-8") as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        path = cache.get("libreoffice_path") if isinstance(cache, dict) else None
+        if not path or cache.get("platform") != self._system:
+            return None
+        mtime = self._executable_mtime(path)
+        if mtime is None or mtime != cache.get("libreoffice_mtime"):
+            return None
+        return path
+
+    def _save_probe_cache(self):
+        """Salva o resultado da detecção do LibreOffice (falhas de escrita são ignoradas)."""
+        if not self.libreoffice_path:
+            return
+        cache = {
+            "platform": self._system,
+            "libreoffice_path": self.libreoffice_path,
+            "libreoffice_mtime": self._executable_mtime(self.libreoffice_path),
+        }
+        try:
+            os.makedirs(os.path.dirname(self.PROBE_CACHE_PATH), exist_ok=True)
+            with open(self.PROBE_CACHE_PATH, "w", encoding="utf-8") as f:
+                json.dump(cache, f)
+        except OSError:
+            pass
+
+    def _executable_mtime(self, path):
+        """Retorna o mtime do executável (resolvendo pelo PATH se necessário) ou None."""
+        if not os.path.isabs(path):
+            path = shutil.which(path)
+            if path is None:
+                return None
+        try:
+            return os.stat(path).st_mtime
+        except OSError:
+            return None
+
+    def prewarm(self):
+        """
+        Carrega antecipadamente no cache de páginas do SO o executável e as bibliotecas do
+        LibreOffice, para que a primeira conversão não pague a leitura do disco.
+        Pensado para rodar em uma thread de fundo; erros são ignorados.
+        """
+        if not self.libreoffice_path:
+            return
+        exe = self.libreoffice_path
+        if not os.path.isabs(exe):
+            exe = shutil.which(exe)
+            if exe is None:
+                return
+        program_dir = os.path.dirname(os.path.realpath(exe))
+
+        if self._is_windows:
+            patterns = ["*.exe", "*.bin", "*.dll"]
+        elif self._system == "Darwin":
+            # No macOS as bibliotecas ficam em Contents/Frameworks
+            patterns = ["soffice", os.path.join("..", "Frameworks", "*.dylib")]
+        else:
+            patterns = ["soffice*", "*.so", "*.so.*"]
+
+        files = [exe]
+        for pattern in patterns:
+            files.extend(glob.glob(os.path.join(program_dir, pattern)))
+
+        use_fadvise = hasattr(os, "posix_fadvise")
+        for path in files:
+            try:
+                with open(path, "rb") as f:
+                    if use_fadvise:
+                        # Pede ao kernel a leitura assíncrona do arquivo inteiro
+                        os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+                    else:
+                        while f.read(1024 * 1024):
+                            pass
+            except OSError:
+                continue
+
     def _is_command_available(self, command):
         """Verifica se um comando está disponível no PATH do sistema."""
         from shutil import which
         return which(command) is not None
 
+    @staticmethod
+    def _get_extension(filename):
+        """Extensão em minúsculas (com o ponto) de um nome de arquivo, ou '' se não houver."""
+        _, dot, ext = filename.rpartition('.')
+        return '.' + ext.lower() if dot else ''
+
     def convert_to_pdf(self, input_path, output_folder):
         """
         Converte um arquivo para PDF.
         Retorna (True, mensagem) em caso de sucesso, ou (False, erro).
         """
-        ext = os.path.splitext(input_path)[1].lower()
         filename = os.path.basename(input_path)
+        ext = self._get_extension(filename)
         
-        if ext not in self.supported_extensions:
+        if ext not in self.SUPPORTED_EXTENSIONS:
             return False, f"Extensão não suportada: {ext}"
 
         # Lógica de decisão: Word vs LibreOffice
         # Preferimos Word para .docx/.doc no Windows pela fidelidade
-        use_word = self.has_word and ext in ['.docx', '.doc']
+        use_word = self.has_word and ext in self.WORD_EXTENSIONS
         
         if use_word:
-            try:
-                from docx2pdf import convert
-                # docx2pdf converte para a mesma pasta se output_path não for especificado,
-                # ou podemos especificar o arquivo de saída.
-                # Para garantir que vá para a output_folder:
-                convert(input_path, output_folder)
-                return True, f"Convertido com Word: {filename}"
-            except Exception as e:
-                # Fallback para LibreOffice se o Word falhar
-                if self.libreoffice_path:
-                    return self._convert_with_libreoffice(input_path, output_folder)
-                return False, f"Erro Word: {str(e)}"
+            success, message = self._convert_with_word(input_path, output_folder)
+            # Fallback para LibreOffice se o Word falhar
+            if not success and self.libreoffice_path:
+                return self._convert_with_libreoffice(input_path, output_folder)
+            return success, message
         
         elif self.libreoffice_path:
             return self._convert_with_libreoffice(input_path, output_folder)
         else:
             return False, "Nenhum conversor (Word ou LibreOffice) encontrado."
 
+    def _convert_with_word(self, input_path, output_folder):
+        """Converte um arquivo com o Word. Retorna (True, mensagem) ou (False, erro), sem fallback."""
+        try:
+            # Importado só aqui: o docx2pdf carrega pywin32/COM, o que é caro
+            from docx2pdf import convert
+            # docx2pdf converte para a mesma pasta se output_path não for especificado,
+            # ou podemos especificar o arquivo de saída.
+            # Para garantir que vá para a output_folder:
+            with self._word_lock:
+                convert(input_path, output_folder)
+            return True, f"Convertido com Word: {os.path.basename(input_path)}"
+        except Exception as e:
+            return False, f"Erro Word: {str(e)}"
+
+    def get_engine(self, input_path):
+        """
+        Indica qual ferramenta converterá o arquivo: 'word', 'lo' (LibreOffice)
+        ou None (extensão não suportada ou nenhum conversor disponível).
+        """
+        ext = self._get_extension(os.path.basename(input_path))
+        if ext not in self.SUPPORTED_EXTENSIONS:
+            return None
+        # Preferimos Word para .docx/.doc no Windows pela fidelidade
+        if self.has_word and ext in self.WORD_EXTENSIONS:
+            return 'word'
+        return 'lo' if self.libreoffice_path else None
+
+    async def convert_many_async(self, input_paths, output_folder, use_resident=False):
+        """
+        Converte vários arquivos que têm a mesma pasta de saída.
+        Arquivos de cada ferramenta (Word/LibreOffice) são agrupados em uma única chamada.
+        O LibreOffice avulso roda como subprocesso assíncrono; as chamadas bloqueantes
+        (Word e LibreOffice residente) vão para uma thread.
+        use_resident: permite usar o LibreOffice residente (veja _convert_with_libreoffice_batch_async).
+        Retorna uma lista de (caminho, sucesso, mensagem).
+        """
+        results = []
+        word_paths = []
+        lo_paths = []
+        for path in input_paths:
+            engine = self.get_engine(path)
+            if engine == 'word':
+                word_paths.append(path)
+            elif engine == 'lo':
+                lo_paths.append(path)
+            else:
+                results.append((path, *self.convert_to_pdf(path, output_folder)))
+
+        if word_paths:
+            # O que o Word não converteu vai para o LibreOffice pelo caminho assíncrono,
+            # para contar no limite de MAX_SOFFICE_PROCESSES
+            fallback = []
+            for path, success, message in await asyncio.to_thread(
+                self._convert_with_word_batch, word_paths, output_folder
+            ):
+                if success or not self.libreoffice_path:
+                    results.append((path, success, message))
+                else:
+                    fallback.append(path)
+            if fallback:
+                results.extend(await self._convert_with_libreoffice_each_async(fallback, output_folder))
+        if lo_paths:
+            results.extend(await self._convert_with_libreoffice_batch_async(lo_paths, output_folder, use_resident))
+        return results
+
+    def _convert_with_word_batch(self, input_paths, output_folder):
+        """
+        Converte vários .docx em uma única sessão do Word: quando recebe uma pasta,
+        o docx2pdf abre o Word uma vez e converte os *.docx dela (só esses: .doc é ignorado
+        no modo pasta). Os .docx são reunidos (hardlink ou cópia) em uma pasta temporária
+        para isso. Os .doc e os .docx que não gerarem PDF são convertidos individualmente.
+        Não recorre ao LibreOffice: as falhas voltam para convert_many_async decidir.
+        """
+        docx_paths = [p for p in input_paths if self._get_extension(os.path.basename(p)) == '.docx']
+        if len(docx_paths) < 2:
+            return [(path, *self._convert_with_word(path, output_folder)) for path in input_paths]
+
+        started = time.time()
+        staging = None
+        try:
+            from docx2pdf import convert
+            staging = tempfile.mkdtemp(prefix="conv_word_")
+            for path in docx_paths:
+                target = os.path.join(staging, os.path.basename(path))
+                try:
+                    os.link(path, target)
+                except OSError:
+                    shutil.copy2(path, target)
+            with self._word_lock:
+                convert(staging, output_folder)
+        except Exception:
+            # Segue para a verificação abaixo: o que não foi gerado é refeito arquivo a arquivo
+            pass
+        finally:
+            # O Word pode manter arquivos abertos por alguns instantes; falhas na limpeza são ignoradas
+            if staging is not None:
+                shutil.rmtree(staging, ignore_errors=True)
+
+        # Só os .docx são verificados pelo PDF: o a.pdf de um a.docx não conta para um a.doc
+        converted = {p for p in docx_paths if self._pdf_written(p, output_folder, started)}
+        results = []
+        for path in input_paths:
+            if path in converted:
+                results.append((path, True, f"Convertido com Word: {os.path.basename(path)}"))
+            else:
+                results.append((path, *self._convert_with_word(path, output_folder)))
+        return results
+
+    async def _convert_with_libreoffice_batch_async(self, input_paths, output_folder, use_resident=False):
+        """
+        Converte um lote de arquivos com uma única chamada do soffice.
+        Se a chamada em lote falhar, os arquivos são convertidos individualmente.
+        O LibreOffice residente é uma única instância (serializada por _soffice_lock), então só
+        é usado para arquivos sozinhos em sua pasta (use_resident, definido em run_conversion):
+        para eles não há lote a amortizar a inicialização. Lotes maiores sempre usam processos
+        avulsos em paralelo, cada um com seu perfil.
+        """
+        if use_resident and len(input_paths) == 1:
+            async with self._soffice_slot():
+                if await asyncio.to_thread(self._has_resident_soffice):
+                    return [(input_paths[0], *await asyncio.to_thread(
+                        self._convert_with_libreoffice, input_paths[0], output_folder
+                    ))]
+        if len(input_paths) == 1:
+            return await self._convert_with_libreoffice_each_async(input_paths, output_folder)
+
+        results = []
+        retry = []
+        with self._output_dir(output_folder) as outdir:
+            async with self._soffice_slot():
+                with self._borrow_profile() as profile_arg:
+                    cmd = [
+                        self.libreoffice_path,
+                        '--headless',
+                        profile_arg,
+                        '--convert-to', 'pdf',
+                        *input_paths,
+                        '--outdir', outdir
+                    ]
+                    started = time.time()
+                    try:
+                        await self._run_soffice_async(cmd)
+                    except Exception:
+                        # O soffice nem chegou a rodar: nenhum PDF novo, todos vão para a refação
+                        pass
+
+            # O sucesso de cada arquivo é dado só pelo PDF novo no outdir: a saída do soffice
+            # muda entre versões, e o código de retorno é diferente de 0 se um único arquivo do
+            # lote falhou. Apenas os arquivos sem PDF são refeitos individualmente.
+            for path in input_paths:
+                if self._pdf_written(path, outdir, started):
+                    try:
+                        await asyncio.to_thread(self._finish_pdf, path, outdir, output_folder)
+                        results.append((path, True, f"Convertido com LibreOffice: {os.path.basename(path)}"))
+                    except OSError as e:
+                        results.append((path, False, f"Erro ao mover o PDF: {str(e)}"))
+                else:
+                    # Não gerou PDF no lote: tenta sozinho para obter o erro real
+                    retry.append(path)
+
+        if retry:
+            results.extend(await self._convert_with_libreoffice_each_async(retry, output_folder))
+        return results
+
+    async def _convert_with_libreoffice_each_async(self, input_paths, output_folder):
+        """
+        Converte os arquivos um por processo (cada um com seu próprio perfil), disparados
+        juntos para que a inicialização dos processos se sobreponha; quantos rodam ao
+        mesmo tempo é limitado pelas vagas de MAX_SOFFICE_PROCESSES.
+        """
+        async def convert_one(path):
+            with self._output_dir(output_folder) as outdir:
+                async with self._soffice_slot():
+                    with self._borrow_profile() as profile_arg:
+                        try:
+                            returncode, stderr = await self._run_soffice_async(
+                                self._oneshot_command(path, outdir, profile_arg)
+                            )
+                        except Exception as e:
+                            return path, False, f"Erro genérico LibreOffice: {str(e)}"
+                if returncode != 0:
+                    return path, False, f"Erro LibreOffice: {stderr.decode('utf-8', errors='ignore')}"
+                try:
+                    await asyncio.to_thread(self._finish_pdf, path, outdir, output_folder)
+                except OSError as e:
+                    return path, False, f"Erro ao mover o PDF: {str(e)}"
+            return path, True, f"Convertido com LibreOffice: {os.path.basename(path)}"
+
+        return list(await asyncio.gather(*(convert_one(p) for p in input_paths)))
+
+    def _soffice_slot(self):
+        """
+        Vaga para uma conversão do LibreOffice (limite único de MAX_SOFFICE_PROCESSES).
+        Deve ser obtida antes de emprestar o perfil, para o pool não crescer além do limite.
+        O semáforo é recriado a cada asyncio.run, pois fica preso ao loop em que foi criado.
+        """
+        loop = asyncio.get_running_loop()
+        if self._soffice_slots_loop is not loop:
+            self._soffice_slots = asyncio.Semaphore(self.MAX_SOFFICE_PROCESSES)
+            self._soffice_slots_loop = loop
+        return self._soffice_slots
+
+    async def _run_soffice_async(self, cmd):
+        """
+        Executa o soffice como subprocesso assíncrono e retorna (returncode, stderr).
+        O stdout é descartado; do stderr, que pode ter dezenas de KB de avisos, é lido
+        tudo (para o pipe não encher) mas só os últimos STDERR_TAIL_BYTES são guardados.
+        """
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            **self._spawn_kwargs(stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        )
+        tail = collections.deque(maxlen=self.STDERR_TAIL_BYTES)
+        while chunk := await proc.stderr.read(4096):
+            tail.extend(chunk)
+        await proc.wait()
+        return proc.returncode, bytes(tail)
+
+    def _spawn_kwargs(self, **kwargs):
+        """
+        Argumentos comuns a todo processo soffice iniciado pelo conversor.
+        Invariantes (para o CPython 3.10+ poder usar vfork no Linux em vez de fork+exec,
+        que duplica as tabelas de páginas do processo pai a cada conversão):
+        nada de preexec_fn, pass_fds, shell=True ou troca de sessão/usuário/umask,
+        e o ambiente é herdado (env=None). Toda nova chamada deve passar por aqui.
+        No Python 3.9 não há vfork e o spawn é sempre fork+exec. O posix_spawn não é usado
+        em nenhuma versão: ele exige close_fds=False, e o padrão close_fds=True é mantido
+        de propósito para o soffice não herdar descritores do programa.
+        """
+        # Passar o valor padrão explicitamente (ex.: shell=False) é permitido
+        forbidden = [
+            key for key, default in self.FAST_SPAWN_DEFAULTS.items()
+            if key in kwargs
+            and (tuple(kwargs[key]) if key == "pass_fds" else kwargs[key]) != default
+        ]
+        assert not forbidden, f"Argumentos que desativam o spawn rápido: {sorted(forbidden)}"
+        kwargs["env"] = None
+        kwargs["startupinfo"] = self._startupinfo
+        return kwargs
+
     def _convert_with_libreoffice(self, input_path, output_folder):
-        """Executa a conversão via linha de comando do LibreOffice."""
+        """
+        Converte via LibreOffice, reaproveitando o processo residente quando possível.
+        Se o modo residente não estiver disponível (ou falhar), usa a conversão avulsa.
+        """
+        with self._output_dir(output_folder) as outdir:
+            error = None
+            with self._soffice_lock:
+                desktop = self._get_soffice_desktop()
+                if desktop is not None:
+                    try:
+                        self._convert_with_uno(desktop, input_path, outdir)
+                    except Exception as e:
+                        if self._is_bridge_error(e):
+                            # Processo residente em estado inválido: descarta (é recriado na
+                            # próxima) e converte este arquivo de forma avulsa
+                            self._shutdown_soffice()
+                            desktop = None
+                        else:
+                            # Problema do documento (corrompido, formato inválido...)
+                            error = e
+
+            if desktop is not None:
+                if error is not None:
+                    return False, f"Erro LibreOffice: {str(error)}"
+                try:
+                    self._finish_pdf(input_path, outdir, output_folder)
+                except OSError as e:
+                    return False, f"Erro ao mover o PDF: {str(e)}"
+                return True, f"Convertido com LibreOffice: {os.path.basename(input_path)}"
+
+        return self._convert_with_libreoffice_oneshot(input_path, output_folder)
+
+    def _is_bridge_error(self, exc):
+        """Indica se a falha veio da conexão UNO/processo residente, e não do documento."""
         try:
-            # Comando: soffice --headless --convert-to pdf <file> --outdir <dir>
-            cmd = [
-                self.libreoffice_path,
-                '--headless',
-                '--convert-to', 'pdf',
-                input_path,
-                '--outdir', output_folder
-            ]
-            
-            # No Windows, subprocess precisa de tratamento especial para não abrir janelas de console
-            startupinfo = None
-            if platform.system() == "Windows":
-                startupinfo = subprocess.STARTUPINFO()
-                startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-            
-            result = subprocess.run(
-                cmd, 
-                stdout=subprocess.PIPE, 
-                stderr=subprocess.PIPE,
-                startupinfo=startupinfo,
-                check=True
+            from com.sun.star.lang import DisposedException
+            if isinstance(exc, DisposedException):
+                return True
+        except ImportError:
+            pass
+        return self._soffice_proc is None or self._soffice_proc.poll() is not None
+
+    def _has_resident_soffice(self):
+        """Indica se o LibreOffice residente está (ou pôde ser colocado) no ar."""
+        with self._soffice_lock:
+            return self._get_soffice_desktop() is not None
+
+    def _get_soffice_desktop(self):
+        """
+        Inicia (preguiçosamente) o LibreOffice em modo listener e retorna o Desktop UNO.
+        Retorna None se o módulo 'uno' não estiver disponível ou o processo não subir.
+        """
+        if self._uno_disabled:
+            return None
+        if self._soffice_proc is not None and self._soffice_proc.poll() is None and self._uno_desktop is not None:
+            return self._uno_desktop
+
+        try:
+            # 'uno' vem junto com o LibreOffice (python3-uno no Linux)
+            import uno
+        except ImportError:
+            self._uno_disabled = True
+            return None
+
+        self._shutdown_soffice()
+
+        # Perfil próprio do processo residente, removido em _shutdown_soffice
+        self._resident_profile = tempfile.mkdtemp(prefix="lo_resident_")
+        cmd = [
+            self.libreoffice_path,
+            '--headless',
+            f'--accept=pipe,name={self._soffice_pipe};urp;',
+            '--norestore',
+            '--nologo',
+            '--nodefault',
+            f'-env:UserInstallation={uno.systemPathToFileUrl(self._resident_profile)}',
+        ]
+
+        try:
+            self._soffice_proc = subprocess.Popen(
+                cmd,
+                **self._spawn_kwargs(stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            )
+        except Exception:
+            self._shutdown_soffice()
+            self._uno_disabled = True
+            return None
+
+        # Aguarda o listener aceitar conexões
+        local_ctx = uno.getComponentContext()
+        resolver = local_ctx.ServiceManager.createInstanceWithContext(
+            "com.sun.star.bridge.UnoUrlResolver", local_ctx
+        )
+        url = f"uno:pipe,name={self._soffice_pipe};urp;StarOffice.ComponentContext"
+        deadline = time.monotonic() + self.SOFFICE_STARTUP_TIMEOUT
+        while time.monotonic() < deadline and self._soffice_proc.poll() is None:
+            try:
+                ctx = resolver.resolve(url)
+                self._uno_desktop = ctx.ServiceManager.createInstanceWithContext(
+                    "com.sun.star.frame.Desktop", ctx
+                )
+                return self._uno_desktop
+            except Exception:
+                time.sleep(0.25)
+
+        # Não conseguiu conectar: desiste do modo residente nesta sessão
+        self._shutdown_soffice()
+        self._uno_disabled = True
+        return None
+
+    def _convert_with_uno(self, desktop, input_path, output_folder):
+        """Carrega o documento no LibreOffice residente e exporta para PDF."""
+        import uno
+        from com.sun.star.beans import PropertyValue
+
+        output_path = os.path.join(output_folder, self._pdf_name(input_path))
+
+        doc = desktop.loadComponentFromURL(
+            uno.systemPathToFileUrl(os.path.abspath(input_path)), "_blank", 0,
+            (PropertyValue(Name="Hidden", Value=True),)
+        )
+        if doc is None:
+            # loadComponentFromURL devolve None (sem exceção) para arquivos que não consegue abrir
+            raise ValueError(f"não foi possível abrir o documento {os.path.basename(input_path)}")
+        try:
+            doc.storeToURL(
+                uno.systemPathToFileUrl(os.path.abspath(output_path)),
+                (PropertyValue(Name="FilterName", Value="writer_pdf_Export"),)
             )
+        finally:
+            doc.close(True)
+
+    def _shutdown_soffice(self):
+        """Encerra o LibreOffice residente, se estiver rodando, e remove o seu perfil."""
+        proc, desktop = self._soffice_proc, self._uno_desktop
+        profile_dir = self._resident_profile
+        self._soffice_proc = None
+        self._uno_desktop = None
+        self._resident_profile = None
+
+        if proc is not None and proc.poll() is None:
+            if desktop is not None:
+                # Pede o encerramento pelo UNO: um sinal só alcançaria o launcher
+                # (oosplash no Linux), deixando o soffice.bin órfão
+                try:
+                    desktop.terminate()
+                except Exception:
+                    pass  # A ponte costuma cair durante o próprio encerramento
+                try:
+                    proc.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    pass
+            if proc.poll() is None:
+                proc.terminate()
+                try:
+                    proc.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    proc.kill()
+
+        if profile_dir is not None:
+            shutil.rmtree(profile_dir, ignore_errors=True)
+
+    @contextlib.contextmanager
+    def _borrow_profile(self):
+        """
+        Empresta um perfil de usuário livre (criando um novo se necessário) e fornece o
+        argumento -env:UserInstallation correspondente. O perfil volta ao pool ao final.
+        """
+        with self._profile_lock:
+            profile_dir = self._free_profiles.pop() if self._free_profiles else None
+        if profile_dir is None:
+            profile_dir = tempfile.mkdtemp(prefix="lo_profile_")
+            with self._profile_lock:
+                self._profile_dirs.append(profile_dir)
+        try:
+            yield f"-env:UserInstallation={Path(profile_dir).as_uri()}"
+        finally:
+            with self._profile_lock:
+                self._free_profiles.append(profile_dir)
+
+    def _cleanup_profiles(self):
+        """Remove os perfis temporários criados para as conversões avulsas."""
+        for profile_dir in self._profile_dirs:
+            shutil.rmtree(profile_dir, ignore_errors=True)
+        self._profile_dirs.clear()
+        self._free_profiles.clear()
+
+    @contextlib.contextmanager
+    def _output_dir(self, output_folder):
+        """
+        Fornece o --outdir a usar para output_folder: a própria pasta (padrão) ou, quando
+        _use_scratch indicar, uma subpasta exclusiva da pasta temporária local, removida
+        ao final. Depois da conversão, _finish_pdf coloca o PDF no destino.
+        """
+        if not self._use_scratch(output_folder):
+            yield output_folder
+            return
+        with self._scratch_lock:
+            if self._scratch is None:
+                self._scratch = tempfile.mkdtemp(prefix="conv_")
+        outdir = tempfile.mkdtemp(dir=self._scratch)
+        try:
+            yield outdir
+        finally:
+            shutil.rmtree(outdir, ignore_errors=True)
+
+    def _cleanup_scratch(self):
+        """Remove a pasta temporária de saída, se tiver sido criada."""
+        if self._scratch is not None:
+            shutil.rmtree(self._scratch, ignore_errors=True)
+            self._scratch = None
+
+    def _use_scratch(self, output_folder):
+        """Decide se a saída para output_folder passa pela pasta temporária local."""
+        if self._is_confined_libreoffice():
+            return False
+        if self.scratch_output is not None:
+            return self.scratch_output
+        folder = os.path.abspath(output_folder)
+        if folder not in self._network_folders:
+            self._network_folders[folder] = self._is_network_folder(folder)
+        return self._network_folders[folder]
+
+    def _is_confined_libreoffice(self):
+        """LibreOffice de snap/flatpak enxerga um /tmp privado, diferente do nosso."""
+        path = self.libreoffice_path or ""
+        real = os.path.realpath(shutil.which(path) or path)
+        return any(p.startswith("/snap/") or "flatpak" in p for p in (path, real))
+
+    def _is_network_folder(self, folder):
+        """Indica se a pasta está em um compartilhamento de rede (SMB/NFS etc.)."""
+        try:
+            if self._is_windows:
+                if folder.startswith("\\\\"):
+                    return True  # Caminho UNC (\\servidor\compartilhamento)
+                import ctypes
+                drive = os.path.splitdrive(folder)[0] + "\\"
+                return ctypes.windll.kernel32.GetDriveTypeW(drive) == 4  # DRIVE_REMOTE
+            if self._system == "Linux":
+                return self._mount_fstype(folder) in self.NETWORK_FS_TYPES
+        except Exception:
+            pass
+        return False
+
+    def _mount_fstype(self, folder):
+        """Tipo do sistema de arquivos (de /proc/mounts) do ponto de montagem que contém a pasta."""
+        if self._mount_table is None:
+            table = []
+            with open("/proc/mounts", encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    fields = line.split()
+                    if len(fields) >= 3:
+                        # Espaços e afins vêm escapados em octal (ex.: \040)
+                        mount_point = re.sub(r"\\([0-7]{3})", lambda m: chr(int(m.group(1), 8)), fields[1])
+                        table.append((mount_point, fields[2]))
+            # Pontos de montagem mais longos primeiro: o primeiro prefixo que casar é o certo
+            table.sort(key=lambda item: len(item[0]), reverse=True)
+            self._mount_table = table
+
+        folder = os.path.realpath(folder)
+        for mount_point, fstype in self._mount_table:
+            if folder == mount_point or folder.startswith(mount_point.rstrip("/") + "/"):
+                return fstype
+        return None
+
+    def _pdf_written(self, input_path, outdir, started):
+        """
+        Indica se o PDF de input_path foi gravado em outdir a partir de 'started' (time.time()),
+        para não confundir com um PDF antigo de mesmo nome na pasta de destino.
+        """
+        try:
+            # Tolerância de 2s para sistemas de arquivos com mtime de baixa resolução
+            return os.stat(os.path.join(outdir, self._pdf_name(input_path))).st_mtime >= started - 2
+        except OSError:
+            return False
+
+    @staticmethod
+    def _pdf_name(input_path):
+        """Nome do PDF gerado para um arquivo de entrada (mesmo nome, extensão .pdf)."""
+        filename = os.path.basename(input_path)
+        base, dot, _ = filename.rpartition('.')
+        return (base if dot else filename) + ".pdf"
+
+    def _finish_pdf(self, input_path, outdir, output_folder):
+        """
+        Coloca no destino o PDF gerado em outdir (veja _output_dir): se outdir é a própria
+        pasta de destino não há nada a fazer; senão o PDF é movido, substituindo se já existir.
+        No mesmo volume é só um rename; entre volumes (ex.: compartilhamento de rede),
+        uma única cópia sequencial. Lança OSError se o PDF não tiver sido gerado.
+        """
+        if outdir == output_folder:
+            return
+        name = self._pdf_name(input_path)
+        source = os.path.join(outdir, name)
+        target = os.path.join(output_folder, name)
+        try:
+            os.replace(source, target)
+        except OSError:
+            if not os.path.exists(source):
+                raise
+            shutil.copyfile(source, target)
+
+    def _oneshot_command(self, input_path, output_folder, profile_arg):
+        """Comando: soffice --headless -env:UserInstallation=<perfil> --convert-to pdf <file> --outdir <dir>"""
+        return [
+            self.libreoffice_path,
+            '--headless',
+            profile_arg,
+            '--convert-to', 'pdf',
+            input_path,
+            '--outdir', output_folder
+        ]
+
+    def _convert_with_libreoffice_oneshot(self, input_path, output_folder):
+        """Executa a conversão via linha de comando do LibreOffice."""
+        try:
+            tail = collections.deque(maxlen=self.STDERR_TAIL_BYTES)
+            with self._output_dir(output_folder) as outdir:
+                with self._borrow_profile() as profile_arg:
+                    proc = subprocess.Popen(
+                        self._oneshot_command(input_path, outdir, profile_arg),
+                        **self._spawn_kwargs(stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+                    )
+                    # Só há um pipe, então drená-lo aqui mesmo basta para não travar o processo
+                    with proc.stderr:
+                        for chunk in iter(lambda: proc.stderr.read(4096), b""):
+                            tail.extend(chunk)
+                    returncode = proc.wait()
+                if returncode != 0:
+                    return False, f"Erro LibreOffice: {bytes(tail).decode('utf-8', errors='ignore')}"
+                try:
+                    self._finish_pdf(input_path, outdir, output_folder)
+                except OSError as e:
+                    return False, f"Erro ao mover o PDF: {str(e)}"
             return True, f"Convertido com LibreOffice: {os.path.basename(input_path)}"
-        except subprocess.CalledProcessError as e:
-            return False, f"Erro LibreOffice: {e.stderr.decode('utf-8', errors='ignore')}"
         except Exception as e:
             return False, f"Erro genérico LibreOffice: {str(e)}"
 
 
 class ConverterApp(ctk.CTk):
+    # Cache da varredura de pastas entre execuções do programa
+    FOLDER_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "conversor", "folders.json")
+    # Pastas alteradas a menos de 2 s do início da varredura não entram no cache
+    FOLDER_CACHE_RACY_NS = 2_000_000_000
+
     def __init__(self):
         super().__init__()
 
         self.title("Conversor de Documentos para PDF")
         self.geometry("700x550")
         
-        self.converter = DocumentConverter()
+        # Criado em segundo plano (detecção de Word/LibreOffice) para a janela abrir logo
+        self.converter = None
         self.selected_files = []
         self.is_converting = False
+        # Mensagens de log acumuladas e gravadas no textbox em lote (~10x por segundo)
+        self._log_buf = []
+        self._log_pending = False
+        # Varredura de pastas: {pasta: [mtime_ns, arquivos compatíveis, subpastas]}, carregado sob demanda
+        self._folder_cache = None
+        self._folder_cache_dirty = False
+        # Atualizações da thread de conversão, aplicadas de forma agrupada na thread do Tk
+        self._update_lock = threading.Lock()
+        self._pending_messages = []
+        self._pending_progress = None
+        self._update_scheduled = False
 
         self._setup_ui()
+
+        # Seleção fica bloqueada até os conversores serem detectados
+        self.btn_file.configure(state="disabled")
+        self.btn_folder.configure(state="disabled")
+        self.log_message("Detectando conversores...")
+        threading.Thread(target=self._init_converter_bg, daemon=True).start()
+
+    def _init_converter_bg(self):
+        """Cria o DocumentConverter fora da thread do Tk e avisa a interface ao terminar."""
+        try:
+            converter = DocumentConverter()
+        except Exception as e:
+            self.after(0, self._on_converter_failed, e)
+            return
+        self.after(0, self._on_converter_ready, converter)
+
+    def _on_converter_failed(self, error):
+        # Sem conversor não há o que selecionar: os botões continuam desabilitados
+        self.log_message(f"Erro ao detectar os conversores: {str(error)}")
+        from tkinter import messagebox
+        messagebox.showerror("Erro", f"Não foi possível inicializar o conversor:\n{str(error)}")
+
+    def _on_converter_ready(self, converter):
+        self.converter = converter
+        self.btn_file.configure(state="normal")
+        self.btn_folder.configure(state="normal")
         self._check_dependencies()
 
+        # Aquece o cache de disco do LibreOffice enquanto o usuário escolhe os arquivos
+        threading.Thread(target=self.converter.prewarm, daemon=True).start()
+
     def _setup_ui(self):
         # Layout de Grid
         self.grid_columnconfigure(0, weight=1)
@@ -220,15 +996,28 @@ class ConverterApp(ctk.CTk):
         self.log_message("\n".join(status))
         
         if not self.converter.has_word and not self.converter.libreoffice_path:
+            from tkinter import messagebox
             messagebox.showwarning("Aviso", "Nenhum conversor encontrado!\nInstale o MS Word ou LibreOffice.")
 
     def log_message(self, message):
+        self._log_buf.append(message)
+        if not self._log_pending:
+            self._log_pending = True
+            self.after(100, self._flush_log)
+
+    def _flush_log(self):
+        self._log_pending = False
+        if not self._log_buf:
+            return
+        text = "\n".join(self._log_buf) + "\n"
+        self._log_buf.clear()
         self.log_box.configure(state="normal")
-        self.log_box.insert("end", message + "\n")
+        self.log_box.insert("end", text)
         self.log_box.see("end")
         self.log_box.configure(state="disabled")
 
     def select_files(self):
+        from tkinter import filedialog
         files = filedialog.askopenfilenames(
             filetypes=[("Documentos", "*.docx *.doc *.odt *.rtf")]
         )
@@ -239,22 +1028,135 @@ class ConverterApp(ctk.CTk):
             self.log_message(f"Selecionados: {len(files)} arquivos.")
 
     def select_folder(self):
+        from tkinter import filedialog
         folder = filedialog.askdirectory()
         if folder:
-            found_files = []
-            for root, dirs, files in os.walk(folder):
-                for file in files:
-                    if os.path.splitext(file)[1].lower() in self.converter.supported_extensions:
-                        found_files.append(os.path.join(root, file))
-            
-            if found_files:
-                self.selected_files = found_files
-                self.update_selection_label(f"Pasta: {folder} ({len(found_files)} arquivos compatíveis)")
-                self.btn_convert.configure(state="normal")
-                self.log_message(f"Pasta selecionada. {len(found_files)} arquivos encontrados.")
+            # A varredura roda em segundo plano para não travar a interface em pastas grandes
+            self.btn_file.configure(state="disabled")
+            self.btn_folder.configure(state="disabled")
+            self.btn_convert.configure(state="disabled")
+            self.update_selection_label(f"Procurando arquivos em: {folder}...")
+            threading.Thread(target=self._scan_folder, args=(folder,), daemon=True).start()
+
+    def _scan_folder(self, folder):
+        """Varre a pasta (thread de fundo), informando o progresso a cada 100 arquivos."""
+        ext_set = self.converter.SUPPORTED_NO_DOT
+        found_files = []
+        try:
+            for path in self._iter_docs(folder, ext_set):
+                found_files.append(path)
+                if len(found_files) % 100 == 0:
+                    self.after(0, self.update_selection_label,
+                               f"Pasta: {folder} ({len(found_files)} arquivos encontrados até agora...)")
+            self._save_folder_cache()
+        except Exception as e:
+            self.after(0, self._on_folder_scan_failed, folder, e)
+            return
+        self.after(0, self._on_folder_scanned, folder, found_files)
+
+    def _iter_docs(self, folder, ext_set):
+        """
+        Percorre a árvore com os.scandir (sem seguir links simbólicos) e gera os caminhos
+        cujas extensões (sem o ponto) estão em ext_set.
+        Pastas cujo mtime não mudou desde a última varredura não são relidas: o mtime de
+        uma pasta só muda quando entradas são criadas, removidas ou renomeadas nela,
+        então apenas as subárvores alteradas são varridas de novo.
+        """
+        cache = self._load_folder_cache()
+        scan_started = time.time_ns()
+        stack = [folder]
+        while stack:
+            directory = stack.pop()
+            try:
+                mtime = os.stat(directory).st_mtime_ns
+            except OSError:
+                cache.pop(directory, None)
+                continue
+
+            cached = cache.get(directory)
+            # Entradas com formato inesperado (cache corrompido ou de outra versão) são ignoradas
+            if (isinstance(cached, list) and len(cached) == 3 and cached[0] == mtime
+                    and isinstance(cached[1], list) and isinstance(cached[2], list)):
+                _, files, subdirs = cached
             else:
-                self.update_selection_label("Nenhum arquivo compatível encontrado na pasta.")
-                self.btn_convert.configure(state="disabled")
+                files = []
+                subdirs = []
+                try:
+                    with os.scandir(directory) as it:
+                        for entry in it:
+                            try:
+                                if entry.is_dir(follow_symlinks=False):
+                                    subdirs.append(entry.name)
+                                    continue
+                                # Como no os.walk: links para pastas não são seguidos nem tratados
+                                # como arquivo; links para arquivos contam (is_file segue o link)
+                                if not entry.is_file():
+                                    continue
+                                # Sem o ponto, rpartition devolveria o nome inteiro ('docx' etc.)
+                                _, dot, ext = entry.name.rpartition('.')
+                                if dot and ext.lower() in ext_set:
+                                    files.append(entry.name)
+                            except OSError:
+                                continue
+                except OSError:
+                    # Pasta sem permissão de leitura ou removida durante a varredura
+                    cache.pop(directory, None)
+                    continue
+                if mtime >= scan_started - self.FOLDER_CACHE_RACY_NS:
+                    # mtime "racy" (como no índice do git): a pasta pode mudar de novo sem que o
+                    # mtime avance, dada a granularidade do sistema de arquivos; não guarda no cache
+                    if cache.pop(directory, None) is not None:
+                        self._folder_cache_dirty = True
+                else:
+                    cache[directory] = [mtime, files, subdirs]
+                    self._folder_cache_dirty = True
+
+            for name in files:
+                yield os.path.join(directory, name)
+            stack.extend(os.path.join(directory, name) for name in subdirs)
+
+    def _load_folder_cache(self):
+        """Carrega (uma vez) o cache de varredura salvo em execuções anteriores."""
+        if self._folder_cache is None:
+            try:
+                with open(self.FOLDER_CACHE_PATH, encoding="utf-8") as f:
+                    cache = json.load(f)
+            except (OSError, ValueError):
+                cache = None
+            self._folder_cache = cache if isinstance(cache, dict) else {}
+        return self._folder_cache
+
+    def _save_folder_cache(self):
+        """Grava o cache de varredura se ele mudou (falhas de escrita são ignoradas)."""
+        if not self._folder_cache_dirty:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.FOLDER_CACHE_PATH), exist_ok=True)
+            with open(self.FOLDER_CACHE_PATH, "w", encoding="utf-8") as f:
+                json.dump(self._folder_cache, f)
+            self._folder_cache_dirty = False
+        except OSError:
+            pass
+
+    def _on_folder_scanned(self, folder, found_files):
+        self.btn_file.configure(state="normal")
+        self.btn_folder.configure(state="normal")
+
+        if found_files:
+            self.selected_files = found_files
+            self.update_selection_label(f"Pasta: {folder} ({len(found_files)} arquivos compatíveis)")
+            self.btn_convert.configure(state="normal")
+            self.log_message(f"Pasta selecionada. {len(found_files)} arquivos encontrados.")
+        else:
+            self.update_selection_label("Nenhum arquivo compatível encontrado na pasta.")
+            self.btn_convert.configure(state="disabled")
+
+    def _on_folder_scan_failed(self, folder, error):
+        self.btn_file.configure(state="normal")
+        self.btn_folder.configure(state="normal")
+        self.btn_convert.configure(state="normal" if self.selected_files else "disabled")
+        self.update_selection_label("Erro ao varrer a pasta.")
+        self.log_message(f"[ERRO] Falha ao varrer {folder}: {str(error)}")
 
     def update_selection_label(self, text):
         self.lbl_selection.configure(text=text)
@@ -274,49 +1176,105 @@ class ConverterApp(ctk.CTk):
 
     def run_conversion(self):
         total = len(self.selected_files)
-        success_count = 0
         
-        self.log_message("-" * 30)
-        self.log_message("Iniciando conversão...")
+        self._post_update(["-" * 30, "Iniciando conversão..."])
 
-        for i, file_path in enumerate(self.selected_files):
-            # Define output folder (mesma do arquivo original)
-            output_folder = os.path.dirname(file_path)
-            
-            # Atualiza UI de forma segura (embora simples, o ideal seria after, mas ctk aguenta chamadas simples)
-            # Para ser 100% correto com tkinter, usaremos after para atualizações visuais se necessário,
-            # mas aqui vamos direto para simplificar o exemplo, pois ctk costuma tolerar.
-            # Se der erro, mudaremos para self.after.
-            
-            success, msg = self.converter.convert_to_pdf(file_path, output_folder)
-            
-            if success:
-                success_count += 1
-                self.log_message(f"[OK] {msg}")
-            else:
-                self.log_message(f"[ERRO] {msg}")
-            
-            progress = (i + 1) / total
-            self.progress_bar.set(progress)
-        
-        self.log_message("-" * 30)
-        self.log_message(f"Concluído! {success_count}/{total} arquivos convertidos.")
+        # Agrupa por ferramenta e pasta de saída (mesma do arquivo original), pois o
+        # --outdir do LibreOffice e a sessão do Word são por chamada
+        groups = collections.defaultdict(list)
+        for file_path in self.selected_files:
+            groups[self.converter.get_engine(file_path), os.path.dirname(file_path)].append(file_path)
+
+        # O Word converte o grupo inteiro em uma sessão; o LibreOffice vai em lotes menores.
+        # Só grupos de um único arquivo usam o LibreOffice residente (sem lote a amortizar).
+        batches = []
+        for (engine, output_folder), paths in groups.items():
+            batch_size = len(paths) if engine == 'word' else self.converter.BATCH_SIZE
+            use_resident = engine == 'lo' and len(paths) == 1
+            batches.extend(
+                (paths[start:start + batch_size], output_folder, use_resident)
+                for start in range(0, len(paths), batch_size)
+            )
+
+        # O pipeline assíncrono roda em um loop próprio nesta thread; o mainloop do Tk
+        # não é tocado e as atualizações visuais são enviadas via _post_update.
+        success_count = asyncio.run(self._run_conversion_async(batches, total))
+
+        self._post_update(["-" * 30, f"Concluído! {success_count}/{total} arquivos convertidos."])
         
-        # Restaura UI
-        self.after(0, self.reset_ui)
+        # Restaura UI (after_idle: roda depois da última atualização pendente)
+        self.after_idle(self.reset_ui)
+
+    async def _run_conversion_async(self, batches, total):
+        """
+        Converte os lotes concorrentemente; retorna o total de sucessos.
+        Quantos processos do LibreOffice rodam ao mesmo tempo é limitado dentro do conversor
+        (MAX_SOFFICE_PROCESSES), inclusive nas refações arquivo a arquivo.
+        """
+        done = 0
+        success_count = 0
+
+        async def run_batch(batch, output_folder, use_resident):
+            nonlocal done, success_count
+            try:
+                results = await self.converter.convert_many_async(batch, output_folder, use_resident)
+            except Exception as e:
+                results = [(p, False, f"Erro inesperado: {str(e)}") for p in batch]
+
+            messages = []
+            for file_path, success, msg in results:
+                if success:
+                    success_count += 1
+                    messages.append(f"[OK] {msg}")
+                else:
+                    messages.append(f"[ERRO] {msg}")
+
+            done += len(batch)
+            self._post_update(messages, done / total)
+
+        await asyncio.gather(*(run_batch(*batch) for batch in batches))
+        return success_count
+
+    def _post_update(self, messages=(), progress=None):
+        """
+        Registra mensagens de log e/ou o progresso vindos da thread de conversão.
+        Mantém no máximo uma atualização agendada (via after_idle); o progresso é
+        sobrescrito, então só o valor mais recente é desenhado.
+        """
+        with self._update_lock:
+            self._pending_messages.extend(messages)
+            if progress is not None:
+                self._pending_progress = progress
+            if self._update_scheduled:
+                return
+            self._update_scheduled = True
+        self.after_idle(self._apply_update)
+
+    def _apply_update(self):
+        """Aplica, na thread do Tk, as atualizações acumuladas por _post_update."""
+        with self._update_lock:
+            messages, self._pending_messages = self._pending_messages, []
+            progress, self._pending_progress = self._pending_progress, None
+            self._update_scheduled = False
+
+        if progress is not None:
+            self.progress_bar.set(progress)
+        for message in messages:
+            self.log_message(message)
 
     def reset_ui(self):
         self.is_converting = False
         self.btn_convert.configure(state="normal", text="Converter para PDF")
         self.btn_file.configure(state="normal")
         self.btn_folder.configure(state="normal")
+        from tkinter import messagebox
         messagebox.showinfo("Sucesso", "Processo de conversão finalizado!")
 
 if __name__ == "__main__":
     # Instruções de Instalação
     print("--- Conversor de Documentos ---")
     print("Requisitos:")
-    print("1. Python 3.x")
+    print("1. Python 3.9+")
     print("2. Bibliotecas: pip install customtkinter docx2pdf")
     print("3. Softwares: Microsoft Word (para .docx/.doc) E/OU LibreOffice (para .odt/.rtf)")
     print("-------------------------------")